@@ -0,0 +1,313 @@
+from math import exp, log, pi, sqrt
+from conductor import *
+
+# 体积热容 J/(m3·℃)，IEC 60949-1988 表I
+HEAT_CAPACITY = {'AL': 2.5e6,
+                 'ST': 3.8e6}
+# 短路时材料最高允许温度（℃），GB 50545-2010 铝及铝合金取200℃，钢取400℃
+TEMPERATURE_LIMIT = {'AL': 200,
+                     'ST': 400}
+# 单一材质绞线 单线根数: 绞入增量(%)，由表A.2计算面积与20℃直流电阻反算
+HOMO_LAMBDA = {7: 1.25,
+               19: 1.65,
+               37: 1.95,
+               61: 2.2,
+               91: 2.3}
+EXPONENT_MAX = 700  # exp()的指数上限，超过时视为温度无穷大
+NEWTON_TOLERANCE = 1e-12  # 多层导体求解最终温度的相对收敛精度
+NEWTON_ITERATIONS = 50  # 多层导体求解最终温度的最大迭代次数
+
+
+def get_grade(conductor: Conductor) -> str:
+    """
+    由导线型号获取导体材料代号，如JLHA1-240返回LHA1，JL/G1A-240/30返回L
+    :param conductor: 导线实例对象
+    :return: 返回导体（外层导体）材料代号
+    """
+    return conductor.name.split('-')[0].split('/')[0].strip().upper()[1:]
+
+
+def get_materials(conductor: Conductor) -> list | None:
+    """
+    获取导线各组成材料
+    :param conductor: 导线实例对象
+    :return: 返回材料列表，元素为HEAT_CAPACITY、TEMPERATURE_LIMIT的键，不支持的导线返回None
+    """
+    if isinstance(conductor, ConductorHomo):
+        grade = get_grade(conductor)
+        # 仅支持铝及铝合金；铝包钢（LB）热容与铝、钢截面比例有关，钢（G）无电阻率数据，均不支持
+        if grade in Conductor.conductor_iacs and not grade.startswith('LB'):
+            return ['AL']
+        return None
+    elif isinstance(conductor, ConductorCompositeAluminum):
+        return ['AL']
+    elif isinstance(conductor, ConductorCompositeSteel):
+        return ['AL', 'ST']
+    else:
+        return None
+
+
+def get_core_section(conductor: ConductorCompositeSteel) -> float | None:
+    """
+    由钢芯直径及绞线结构计算钢芯截面积
+    :param conductor: 钢芯绞线实例对象
+    :return: 返回钢芯截面积（mm2），绞线结构未知时返回None
+    """
+    if conductor.structure not in ConductorCompositeSteel.structures:
+        return None
+    wires = int(conductor.structure.split('_')[-1])  # structure为 s铝线根数_钢线根数
+    layers = 0
+    while 3 * layers * layers + 3 * layers + 1 < wires:  # 1、7、19、37根分别对应0、1、2、3层
+        layers += 1
+    wire_diameter = conductor.core_diameter / (2 * layers + 1)
+    return wires * pi * pow(wire_diameter, 2) / 4
+
+
+def get_homo_section(conductor: ConductorHomo) -> float | None:
+    """
+    由电阻率及20℃直流电阻计算单一材质绞线截面积 A = ρ20·λ / R20
+    单线根数未知，取由外径计算的几何截面与A最接近的同心绞线结构确定绞入增量λ
+    :param conductor: 单一材质绞线实例对象
+    :return: 返回截面积（mm2），材料电阻率未知时返回None
+    """
+    rou20 = Conductor.get_rou20(Conductor.conductor_iacs.get(get_grade(conductor), 0))
+    if rou20 is None:
+        return None
+    section = None
+    deviation = None
+    for wires, increment in HOMO_LAMBDA.items():
+        layers = 0
+        while 3 * layers * layers + 3 * layers + 1 < wires:
+            layers += 1
+        geometric = wires * pi * pow(conductor.diameter / (2 * layers + 1), 2) / 4
+        electric = rou20 * (1 + increment / 100) / conductor.r20 * 1000  # r20单位为Ω/km
+        if deviation is None or abs(geometric / electric - 1) < deviation:
+            section = electric
+            deviation = abs(geometric / electric - 1)
+    return section
+
+
+def get_temperature_limit(conductor: Conductor) -> float | None:
+    """
+    获取导线短路时最高允许温度，取导线各组成材料允许温度的最小值
+    :param conductor: 导线实例对象
+    :return: 返回最高允许温度（℃），不支持的导线返回None
+    """
+    materials = get_materials(conductor)
+    if materials is None:
+        return None
+    return min(TEMPERATURE_LIMIT[material] for material in materials)
+
+
+def get_thermal_parameters(conductor: Conductor) -> tuple | None:
+    """
+    获取导线绝热温升计算参数
+    :param conductor: 导线实例对象
+    :return: 返回元组(载流层列表[(20℃直流电阻（Ω/m），电阻温度系数)]，单位长度热容（J/m/℃），最高允许温度（℃）)，
+             不支持的导线返回None
+    """
+    temperature_limit = get_temperature_limit(conductor)
+    if temperature_limit is None:
+        return None
+    if isinstance(conductor, ConductorHomo):
+        section = get_homo_section(conductor)
+        if section is None:
+            return None
+        layers = [(conductor.r20 / 1000, conductor.alpha)]
+        capacity = HEAT_CAPACITY['AL'] * section
+    elif isinstance(conductor, ConductorCompositeAluminum):
+        # 与get_rdc相同，内外层并联；电阻率单位为Ω·mm2/m，电阻即为Ω/m
+        layers = [(conductor.inner_rou20 * conductor.inner_lambda / conductor.inner_section, conductor.inner_alpha),
+                  (conductor.outer_rou20 * conductor.outer_lambda / conductor.outer_section, conductor.outer_alpha)]
+        capacity = HEAT_CAPACITY['AL'] * (conductor.outer_section + conductor.inner_section)
+    else:
+        # section为铝、钢计算面积总和；钢芯不通过电流，但与铝层温度相同，参与吸热
+        core_section = get_core_section(conductor)
+        if core_section is None:
+            return None
+        layers = [(conductor.r20 / 1000, conductor.alpha)]
+        capacity = HEAT_CAPACITY['AL'] * (conductor.section - core_section) + HEAT_CAPACITY['ST'] * core_section
+    return layers, capacity / 1000000, temperature_limit
+
+
+def get_heat(layers: list, temperature: float) -> float:
+    """
+    计算单位热容由20℃升至指定温度所需的I2·t
+    I2·R(θ)·dt = C·dθ，各载流层并联，积分得 I2·t / C = Σ ln(1 + αk(θ - 20)) / (Rk·αk)
+    :param layers: 载流层列表[(20℃直流电阻（Ω/m），电阻温度系数)]
+    :param temperature: 导线温度（℃）
+    :return: 返回I2·t / C（A2·s·m·℃/J）
+    """
+    return sum(log(get_resistance(1, alpha, temperature)) / (r20 * alpha) for r20, alpha in layers)
+
+
+def get_permissible_joules(conductors: list, initial_temperature: float = 70) -> list:
+    """
+    计算导线由短路前温度升至最高允许温度所需的I2·t = C·(get_heat(θm) - get_heat(θ0))
+    :param conductors: 导线实例对象列表
+    :param initial_temperature: 短路前导线温度（℃）
+    :return: 返回列表，元素为各导线允许的I2·t（A2·s），短路前温度高于最高允许温度时为负，不支持的导线为None
+    """
+    joules = []
+    for conductor in conductors:
+        parameters = get_thermal_parameters(conductor)
+        if parameters is None:
+            joules.append(None)
+            continue
+        layers, capacity, temperature_limit = parameters
+        joules.append(capacity * (get_heat(layers, temperature_limit) - get_heat(layers, initial_temperature)))
+    return joules
+
+
+def get_final_temperatures(conductors: list, scenarios: list, initial_temperature: float = 70) -> list:
+    """
+    绝热条件下批量计算短路后的导线温度
+    单一载流层时 θ = 20 + ((1 + α(θ0 - 20))·exp(α·R20·I2·t / C) - 1) / α
+    多层并联时以各层电导加权的等效参数按上式估算，再以牛顿法求解get_heat(θ) = get_heat(θ0) + I2·t / C
+    :param conductors: 导线实例对象列表
+    :param scenarios: 短路工况列表，元素为(短路电流（A），切除时间（s）)
+    :param initial_temperature: 短路前导线温度（℃）
+    :return: 返回二维列表，[i][j]为第i个工况下第j根导线的最终温度（℃），
+             不支持的导线为None，切除时间不大于0时整行为None
+    """
+    columns = []  # 每根导线的 (载流层列表, C, get_heat(θ0), 等效R20, 等效α)
+    for conductor in conductors:
+        parameters = get_thermal_parameters(conductor)
+        if parameters is None:
+            columns.append(None)
+            continue
+        layers, capacity, _ = parameters
+        conductance = sum(1 / r20 for r20, _ in layers)
+        alpha = sum(alpha / r20 for r20, alpha in layers) / conductance
+        columns.append((layers, capacity, get_heat(layers, initial_temperature), 1 / conductance, alpha))
+    rows = []
+    for intensity, duration in scenarios:
+        if duration <= 0:
+            rows.append([None] * len(columns))
+            continue
+        joule = intensity * intensity * duration  # I2·t（A2·s）
+        row = []
+        for column in columns:
+            if column is None:
+                row.append(None)
+                continue
+            layers, capacity, heat, r20, alpha = column
+            target = heat + joule / capacity
+            exponent = r20 * alpha * target
+            if exponent > EXPONENT_MAX:
+                row.append(float('inf'))
+                continue
+            temperature = 20 + (exp(exponent) - 1) / alpha
+            if len(layers) > 1:
+                # get_heat为增函数且上凸，牛顿法迭代一步后自下方单调收敛
+                for _ in range(NEWTON_ITERATIONS):
+                    heat = 0
+                    conductance = 0
+                    for r, a in layers:
+                        ratio = get_resistance(1, a, temperature)
+                        heat += log(ratio) / (r * a)
+                        conductance += 1 / (r * ratio)
+                    step = (target - heat) / conductance
+                    temperature = max(temperature + step, initial_temperature)
+                    if abs(step) < NEWTON_TOLERANCE * abs(temperature):
+                        break
+            row.append(temperature)
+        rows.append(row)
+    return rows
+
+
+def get_permissible_intensities(conductors: list, durations: list, initial_temperature: float = 70) -> list:
+    """
+    绝热条件下批量计算导线允许短路电流
+    I = sqrt(C·(get_heat(θm) - get_heat(θ0)) / t)，单一载流层时即 C·ln((1 + α(θm - 20)) / (1 + α(θ0 - 20))) / (α·R20·t)
+    :param conductors: 导线实例对象列表
+    :param durations: 切除时间列表（s）
+    :param initial_temperature: 短路前导线温度（℃）
+    :return: 返回二维列表，[i][j]为第i个切除时间下第j根导线的允许短路电流（A），
+             不支持的导线为None，切除时间不大于0时整行为None，短路前温度不低于最高允许温度时为0
+    """
+    columns = [None if joule is None else max(joule, 0.0)
+               for joule in get_permissible_joules(conductors, initial_temperature)]
+    rows = []
+    for duration in durations:
+        if duration <= 0:
+            rows.append([None] * len(columns))
+            continue
+        rows.append([None if joule is None else sqrt(joule / duration) for joule in columns])
+    return rows
+
+
+def check_thermal_withstand(conductors: list, scenarios: list, initial_temperature: float = 70) -> list:
+    """
+    批量校验导线短路热稳定
+    get_heat随温度单调递增，最终温度超过最高允许温度等价于I2·t超过get_permissible_joules，无需求解最终温度
+    :param conductors: 导线实例对象列表
+    :param scenarios: 短路工况列表，元素为(短路电流（A），切除时间（s）)
+    :param initial_temperature: 短路前导线温度（℃）
+    :return: 返回二维列表，[i][j]为第i个工况下第j根导线是否超过最高允许温度，
+             不支持的导线及切除时间不大于0的工况为None
+    """
+    columns = get_permissible_joules(conductors, initial_temperature)
+    rows = []
+    for intensity, duration in scenarios:
+        if duration <= 0:
+            rows.append([None] * len(columns))
+            continue
+        joule = intensity * intensity * duration  # I2·t（A2·s）
+        rows.append([None if permissible is None else joule > permissible for permissible in columns])
+    return rows
+
+
+if __name__ == '__main__':
+    # 手算校验：JL/G1A-10/2，总面积12.4mm2，钢芯1根1.50mm，20℃直流电阻2.7062Ω/km
+    # C = 2.5×(12.4 - 1.7671) + 3.8×1.7671 = 33.297 J/(m·℃)
+    # 70℃→200℃允许I2·t = C·ln(1.7254 / 1.2015) / (0.00403×2.7062e-3) = 1.1049e6 A2·s
+    steel = Conductor.parse(f"{ConductorCompositeSteel.sign_str},JL/G1A-10/2,4.50,1.50,2.7062,0.00403,12.4,s6_1")
+    _, steel_capacity, steel_limit = get_thermal_parameters(steel)
+    assert abs(steel_capacity - 33.297) < 0.001, steel_capacity
+    assert steel_limit == 200, steel_limit
+    steel_intensity = get_permissible_intensities([steel], [1])[0][0]
+    assert abs(steel_intensity * steel_intensity - 1.1049e6) < 100, steel_intensity
+
+    # 表A.2 JLHA1-240：计算面积240mm2，19根，外径20.1mm，20℃直流电阻0.1393Ω/km
+    homo = Conductor.parse(f"{ConductorHomo.sign_str},JLHA1-240,20.1,0.1393,0.0036")
+    assert abs(get_homo_section(homo) / 240 - 1) < 0.005, get_homo_section(homo)
+    # 70℃→200℃允许I2·t = 2.5×A·ln(1.648 / 1.18) / (0.0036×1.393e-4)
+    homo_joule = 2.5 * get_homo_section(homo) * log(1.648 / 1.18) / (0.0036 * 1.393e-4)
+    homo_intensity = get_permissible_intensities([homo], [1])[0][0]
+    assert abs(homo_intensity * homo_intensity / homo_joule - 1) < 1e-9, homo_intensity
+
+    # 表A.14 JL/LHA1-25/20：铝24.3mm2、铝合金18.2mm2，结构4/3，以get_rdc数值积分I2·t = C·∫dθ / Rdc(θ)
+    composite = Conductor.parse(f"{ConductorCompositeAluminum.sign_str},JL/LHA1-25/20,8.34,"
+                                f"24.3,{Conductor.get_rou20(0.61)},0.00403,"
+                                f"18.2,{Conductor.get_rou20(0.525)},0.0036,s4_3")
+    _, composite_capacity, _ = get_thermal_parameters(composite)
+    steps = 10000
+    composite_joule = composite_capacity * sum(
+        (200 - 70) / steps / composite.get_rdc(70 + (i + 0.5) * (200 - 70) / steps) for i in range(steps))
+    composite_intensity = get_permissible_intensities([composite], [1])[0][0]
+    assert abs(composite_intensity * composite_intensity / composite_joule - 1) < 1e-6, composite_intensity
+
+    # 允许短路电流下的最终温度应恰为最高允许温度
+    samples = [steel, homo, composite]
+    intensities = get_permissible_intensities(samples, [0.5])[0]
+    for sample, intensity in zip(samples, intensities):
+        temperature = get_final_temperatures([sample], [(intensity, 0.5)])[0][0]
+        assert abs(temperature - get_temperature_limit(sample)) < 1e-6, (sample.name, temperature)
+        assert check_thermal_withstand([sample], [(intensity * 0.99, 0.5), (intensity * 1.01, 0.5)]) == [[False], [True]]
+
+    # 极大短路电流时最终温度为无穷大；短路前温度不低于最高允许温度时允许短路电流为0
+    assert get_final_temperatures(samples, [(1e9, 1)]) == [[float('inf')] * 3]
+    assert get_permissible_intensities(samples, [1], initial_temperature=200) == [[0.0] * 3]
+    assert check_thermal_withstand(samples, [(0, 1)], initial_temperature=200) == [[False] * 3]
+    assert check_thermal_withstand(samples, [(0, 1)], initial_temperature=210) == [[True] * 3]
+
+    # 不支持的导线及切除时间不大于0时均返回None
+    unknown = ConductorCompositeSteel('UNKNOWN', 4.50, 1.50, 2.7062, 0.00403, 12.4, 's0_0')
+    clad = Conductor.parse(f"{ConductorHomo.sign_str},JLB20A-30,6.9,2.954,0.0036")
+    assert get_thermal_parameters(unknown) is None
+    assert get_thermal_parameters(clad) is None
+    assert get_permissible_intensities([steel, unknown], [0, -1]) == [[None, None], [None, None]]
+    assert get_final_temperatures([steel, clad], [(1000, 0), (1000, -1)]) == [[None, None], [None, None]]
+    assert check_thermal_withstand([steel], [(1000, -1)]) == [[None]]
+    print(f"{steel.name}：1s允许短路电流{steel_intensity:.1f}A，校验完毕！")